@@ -0,0 +1,71 @@
+import dask
+import pytest
+import rasterio as rio
+
+from raster_tools import Raster
+
+
+def _read_values(path):
+    # Read straight through rasterio to skip building and computing a dask
+    # graph. Flip to increasing y to match the orientation Raster uses.
+    with rio.open(path) as src:
+        values = src.read()
+        if src.transform.e < 0:
+            values = values[:, ::-1]
+    # Shared across the whole session so guard against in-place edits
+    values.flags.writeable = False
+    return values
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _dask_synchronous():
+    # Test rasters are small so thread pool startup and contention outweigh
+    # any parallel speedup, especially when running under pytest-xdist.
+    with dask.config.set(scheduler="synchronous"):
+        yield
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _gdal_env():
+    # Give GDAL a larger block cache and stop it from listing the data dir
+    # looking for sidecar files every time a test raster is opened.
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setenv("GDAL_CACHEMAX", "512")
+        mp.setenv("GDAL_DISABLE_READDIR_ON_OPEN", "EMPTY_DIR")
+        yield
+
+
+@pytest.fixture(scope="session")
+def elev1():
+    rs = Raster("tests/data/elevation_small.tif")
+    yield rs
+    rs.close()
+
+
+@pytest.fixture(scope="session")
+def elev1_np():
+    return _read_values("tests/data/elevation_small.tif")
+
+
+@pytest.fixture(scope="session")
+def elev1_mem(elev1_np):
+    """In-memory copy of elev1 for tests that don't need the file backing."""
+    return Raster(elev1_np)
+
+
+@pytest.fixture(scope="session")
+def elev2():
+    rs = Raster("tests/data/elevation2_small.tif")
+    yield rs
+    rs.close()
+
+
+@pytest.fixture(scope="session")
+def elev2_np():
+    return _read_values("tests/data/elevation2_small.tif")
+
+
+@pytest.fixture(scope="session")
+def elev2_mem(elev2_np):
+    """In-memory copy of elev2 for tests that don't need the file backing."""
+    return Raster(elev2_np)